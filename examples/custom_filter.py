@@ -1,7 +1,7 @@
 '''
 This is an example of a custom filter to filter out the unlisted reblogs in Mastodon.
 '''
-from typing import Iterable
+from typing import Any, Iterable
 
 from mastodon import AttribAccessDict
 
@@ -11,8 +11,8 @@ from mastodon_telegram_bridge import Filter, main
 class ReblogFilter(Filter):
     def __init__(self, *, scope: Iterable[str], rebloged_scope: Iterable[str], **kwargs: Any):
         super().__init__(**kwargs)
-        self.scope = scope
-        self.rebloged_scope = rebloged_scope
+        self.scope = frozenset(scope)
+        self.rebloged_scope = frozenset(rebloged_scope)
 
     def __call__(self, status: AttribAccessDict) -> bool:
         if status['visibility'] not in self.scope:
@@ -1,9 +1,15 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from ._version import __version__
-from .bridge import Bridge
 from .cli import main
-from .filter import Filter
-from .footer import Footer
-from .typing import BridgeOptionsDict, ConfigDict, MastodonToTelegramOptionsDict, OptionsDict, TelegramToMastodonOptionsDict
+
+if TYPE_CHECKING:
+    from .bridge import Bridge
+    from .filter import Filter
+    from .footer import Footer
+    from .typing import (BridgeOptionsDict, ConfigDict, MastodonToTelegramOptionsDict, OptionsDict,
+                         TelegramToMastodonOptionsDict)
 
 __author__ = "cubercsl <hi@cubercsl.site>"
 __license__ = "MIT"
@@ -19,3 +25,21 @@ __all__ = [
     'MastodonToTelegramOptionsDict',
     'TelegramToMastodonOptionsDict',
 ]
+
+# these pull in telegram and mastodon, import them on first access so that `--help` and `--version` start fast
+_LAZY_IMPORTS = {
+    'Bridge': '.bridge',
+    'Filter': '.filter',
+    'Footer': '.footer',
+    'ConfigDict': '.typing',
+    'OptionsDict': '.typing',
+    'BridgeOptionsDict': '.typing',
+    'MastodonToTelegramOptionsDict': '.typing',
+    'TelegramToMastodonOptionsDict': '.typing',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
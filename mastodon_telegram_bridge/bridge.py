@@ -1,25 +1,93 @@
 import asyncio
+import concurrent.futures
 import logging
-import os
-from tempfile import TemporaryDirectory
-from typing import Type, cast
-
-from mastodon import AttribAccessDict, CallbackStreamListener, Mastodon, MastodonAPIError
-from telegram import InputMediaPhoto, InputMediaVideo, Message, Update, Video
-from telegram.constants import ParseMode
-from telegram.ext import Application, CallbackContext, CommandHandler, MessageHandler, TypeHandler
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Awaitable, BinaryIO, Callable, Type, TypeVar, cast
+
+import httpx
+from mastodon import (AttribAccessDict, CallbackStreamListener, Mastodon, MastodonAPIError, MastodonNetworkError,
+                      MastodonRatelimitError, MastodonServerError)
+from telegram import InputMediaPhoto, InputMediaVideo, Message, PhotoSize, Update, Video
+from telegram.constants import MessageLimit, ParseMode
+from telegram.error import NetworkError, RetryAfter
+from telegram.ext import Application, CallbackContext, CommandHandler, Defaults, MessageHandler, TypeHandler
 from telegram.ext.filters import UpdateType
 from telegram.helpers import effective_message_type
 
 from .filter import Filter, MastodonFilter, TelegramFilter
 from .footer import Footer, MastodonFooter, TelegramFooter
 from .typing import (BridgeOptionsDict, MastodonOptionsDict, MastodonToTelegramOptions,
-                     MediaGroup, TelegramOptionsDict, TelegramToMastodonOptions)
-from .utils import format_exception, markdownify
+                     MediaGroup, TelegramOptionsDict, TelegramToMastodonOptions, TelegramWebhookOptionsDict)
+from .utils import format_exception, make_session, markdownify
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar('_T')
+
+# mastodon attachment types that can be sent in a telegram media group
+_INPUT_MEDIA_CLASSES: dict[str, Type[InputMediaPhoto | InputMediaVideo]] = {
+    'image': InputMediaPhoto,
+    'video': InputMediaVideo,
+    # gifv is a silent mp4 on mastodon
+    'gifv': InputMediaVideo,
+}
+
+# statuses waiting to be forwarded before the mastodon stream thread is throttled
+_UPDATE_QUEUE_SIZE = 32
+# seconds the mastodon stream thread waits for a free slot before dropping a status
+_UPDATE_QUEUE_TIMEOUT = 30
+# seconds before the same exception is reported to the private chat again
+_EXCEPTION_REPORT_INTERVAL = 30
+_EXCEPTION_REPORT_TEMPLATE = '```\n{}\n```'
+# keep the report below telegram's message length limit, the end of a traceback is the useful part
+_EXCEPTION_REPORT_MAX_TRACEBACK = 3800
+# seconds of quiet after the latest album item before the album is forwarded
+_MEDIA_GROUP_DEBOUNCE = 1
+# seconds after the first album item the album is forwarded at the latest
+_MEDIA_GROUP_MAX_WAIT = 5
+# tries before a rate limited or failing api call gives up
+_RETRY_MAX_TRIES = 5
+# error reports give up sooner, so they cannot hold up forwarding
+_REPORT_RETRY_MAX_TRIES = 2
+# upper bound of the exponential backoff in seconds, before jitter
+_RETRY_MAX_BACKOFF = 60
+# causes of a telegram network error raised before the request was sent, only these are safe to send again
+_TELEGRAM_RETRY_CAUSES = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# seconds the mastodon stream waits before reconnecting, plus a random part of up to the same again
+_STREAM_RECONNECT_WAIT = 5
+# seconds successful forwards are collected before they are reported to the private chat in one message
+_SUCCESS_REPORT_DELAY = 1
+# bytes of a media kept in memory before it is spilled to a temporary file,
+# bots can download files of up to 20 MB, so this must stay well below that
+_MEDIA_MEMORY_LIMIT = 4 * 1024 * 1024
+# recently forwarded statuses and messages remembered to drop redelivered ones
+_SEEN_UPDATES_SIZE = 512
+
+
+def _get_attachment(message: Message, media_type: str) -> tuple[PhotoSize | Video, str]:
+    """Get the attachment to upload and its mime type from a photo or video message"""
+    if media_type == 'photo':
+        # the last one is the largest size
+        return message.photo[-1], 'image/jpeg'
+    video = cast(Video, message.effective_attachment)
+    return video, video.mime_type or 'video/mp4'
+
+
+def _idempotency_key(message: Message) -> str:
+    """Get the key that makes mastodon post a status only once for a message, even if the request is retried"""
+    return f'telegram-{message.chat_id}-{message.message_id}'
+
 
 class Bridge:
     """The bridge between mastodon and telegram.
@@ -50,12 +118,38 @@ class Bridge:
             ValueError: Both telegram_to_mastodon and mastodon_to_telegram are disabled, nothing to do
         """
         # you can add more arguments in [mastodon] section in config.toml to customize the mastodon client
-        self.mastodon = Mastodon(**mastodon)
-        # TODO: add more arguments in [telegram] section in config.toml to customize the telegram bot
-        self.telegram = Application.builder().token(telegram['token']).build()
+        # all requests share one keep-alive session, so TLS handshakes are not repeated on every api call
+        self.mastodon = Mastodon(**mastodon, session=make_session())
+        # blocking mastodon calls run here, keep it no larger than the session's connection pool
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='mastodon')
+        # every message the bridge sends is markdown, set it once instead of passing it to every call
+        builder = Application.builder().token(telegram['token']) \
+            .defaults(Defaults(parse_mode=ParseMode.MARKDOWN)) \
+            .update_queue(asyncio.Queue(maxsize=_UPDATE_QUEUE_SIZE)) \
+            .post_init(self._start_mastodon_stream)
+        # you can tune update concurrency and the connection pool used by all bot api calls
+        # in [telegram] section in config.toml, get_updates keeps its own connection because it is a long poll
+        if 'concurrent_updates' in telegram:
+            builder.concurrent_updates(telegram['concurrent_updates'])
+        if 'connection_pool_size' in telegram:
+            builder.connection_pool_size(telegram['connection_pool_size'])
+        if 'connect_timeout' in telegram:
+            builder.connect_timeout(telegram['connect_timeout'])
+        if 'read_timeout' in telegram:
+            builder.read_timeout(telegram['read_timeout'])
+        if 'write_timeout' in telegram:
+            builder.write_timeout(telegram['write_timeout'])
+        if 'pool_timeout' in telegram:
+            builder.pool_timeout(telegram['pool_timeout'])
+        self.telegram = builder.build()
+        # receive updates by webhook instead of long polling if it is configured
+        self._webhook: TelegramWebhookOptionsDict | None = telegram.get('webhook')
 
-        self._mastodon_username: str = self.mastodon.me().username
-        self._mastodon_app_name: str = self.mastodon.app_verify_credentials().name
+        # the two lookups are independent, do not wait for one before sending the other
+        me = self._executor.submit(self.mastodon.me)
+        app = self._executor.submit(self.mastodon.app_verify_credentials)
+        self._mastodon_username: str = me.result().username
+        self._mastodon_app_name: str = app.result().name
 
         logger.info('Username: %s, App name: %s', self._mastodon_username, self._mastodon_app_name)
 
@@ -74,54 +168,168 @@ class Bridge:
         self.mastodon_footer = mastodon_footer(**self.telegram_to_mastodon.footer)
         self.telegram_footer = telegram_footer(**self.mastodon_to_telegram.footer)
 
-    async def _send_media_to_mastodon(self, *messages: Message, footer: str, context: CallbackContext) -> None:
+        self._reported_exceptions: dict[tuple[type, str], float] = {}
+        self._success_reports: list[str] = []
+        self._seen_updates: OrderedDict[Any, None] = OrderedDict()
+
+    async def _run_sync(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _call_with_backoff(self, func: Callable[[], Awaitable[_T]], *, max_tries: int = _RETRY_MAX_TRIES) -> _T:
+        """Call a telegram or mastodon api, wait and retry when it is rate limited or fails temporarily.
+
+        Args:
+            func (Callable[[], Awaitable[_T]]): returns a new awaitable of the call for every try
+            max_tries (int, optional): tries before the error is raised. Defaults to 5.
+
+        Returns:
+            _T: the result of the call
+        """
+        attempt = 1
+        while True:
+            try:
+                return await func()
+            except (RetryAfter, MastodonRatelimitError, MastodonServerError, MastodonNetworkError, NetworkError) as exc:
+                # python-telegram-bot wraps every httpx error, including a read error after the message was posted,
+                # in NetworkError, only retry it when the connection could not be established
+                if not isinstance(exc, RetryAfter) and isinstance(exc, NetworkError) \
+                        and not isinstance(exc.__cause__, _TELEGRAM_RETRY_CAUSES):
+                    raise
+                if attempt >= max_tries:
+                    raise
+                if isinstance(exc, RetryAfter):
+                    delay = exc.retry_after + 0.5
+                elif isinstance(exc, MastodonRatelimitError):
+                    delay = max(self.mastodon.ratelimit_reset - time.time(), 1)
+                else:
+                    delay = min(2 ** attempt, _RETRY_MAX_BACKOFF) + random.random()
+                logger.warning('%s, retry in %.1f seconds (%d/%d)', exc, delay, attempt, max_tries)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _is_duplicate(self, key: Any) -> bool:
+        if key in self._seen_updates:
+            return True
+        self._seen_updates[key] = None
+        if len(self._seen_updates) > _SEEN_UPDATES_SIZE:
+            self._seen_updates.popitem(last=False)
+        return False
+
+    async def _report_exception(self, exc: Exception, chat_id: int, context: CallbackContext) -> None:
+        logger.exception(exc)
+        # do not flood the private chat with the same error, e.g. while the network is down
+        now = time.monotonic()
+        self._reported_exceptions = {signature: reported_at for signature, reported_at in self._reported_exceptions.items()
+                                     if now - reported_at < _EXCEPTION_REPORT_INTERVAL}
+        signature = (type(exc), str(exc))
+        if signature in self._reported_exceptions:
+            logger.info('Same exception was reported recently, skip reporting it again.')
+            return
+        self._reported_exceptions[signature] = now
+        try:
+            report = _EXCEPTION_REPORT_TEMPLATE.format(format_exception(exc)[-_EXCEPTION_REPORT_MAX_TRACEBACK:])
+            await self._call_with_backoff(partial(context.bot.send_message, chat_id, report),
+                                          max_tries=_REPORT_RETRY_MAX_TRIES)
+        except Exception as report_exc:
+            logger.warning('Failed to report exception to chat %d: %s', chat_id, report_exc)
+
+    async def _report_success(self, message: Message, status: AttribAccessDict, context: CallbackContext) -> None:
+        if message.is_automatic_forward:
+            await self._call_with_backoff(
+                partial(message.reply_markdown, f'*Successfully forward message to mastodon.*\n{status.url}'))
+        elif context.job_queue is None:
+            self._success_reports.append(status.url)
+            await self._flush_success_reports(context)
+        else:
+            # collect the forwards of a burst and report them in one message
+            if not self._success_reports:
+                context.job_queue.run_once(self._flush_success_reports, _SUCCESS_REPORT_DELAY)
+            self._success_reports.append(status.url)
+
+    async def _flush_success_reports(self, context: CallbackContext) -> None:
+        cfg = self.telegram_to_mastodon
+        urls, self._success_reports = self._success_reports, []
+        header = '*Successfully forward message to mastodon.*'
+        text = header
+        try:
+            for url in urls:
+                if len(text) + len(url) + 1 > MessageLimit.MAX_TEXT_LENGTH:
+                    await self._call_with_backoff(partial(context.bot.send_message, cfg.pm_chat_id, text))
+                    text = header
+                text += f'\n{url}'
+            await self._call_with_backoff(partial(context.bot.send_message, cfg.pm_chat_id, text))
+        except Exception as exc:
+            await self._report_exception(exc, cfg.pm_chat_id, context)
+
+    async def _send_media_to_mastodon(self, *medias: tuple[Message, str], footer: str, context: CallbackContext) -> None:
+
+        async def _upload(buffer: IO[bytes], mime_type: str, file_name: str) -> AttribAccessDict:
+            # rewind the buffer, a retried upload reads it again
+            buffer.seek(0)
+            return await self._run_sync(self.mastodon.media_post, buffer, mime_type=mime_type, file_name=file_name)
+
+        async def _transfer(message: Message, media_type: str) -> AttribAccessDict:
+            attachment, mime_type = _get_attachment(message, media_type)
+            media_file = await attachment.get_file()
+            # keep the media in memory instead of writing it to disk and reading it back,
+            # only large videos are spilled to disk
+            with SpooledTemporaryFile(max_size=_MEDIA_MEMORY_LIMIT) as buffer:
+                await media_file.download_to_memory(out=cast(BinaryIO, buffer))
+                return await self._call_with_backoff(partial(_upload, buffer, mime_type, media_file.file_unique_id))
 
-        async def _wait_for_media_ready(media_ids: list[int]) -> None:
+        async def _wait_for_media_ready(media_ids: list[int], retries: int = 5) -> None:
             wait_time = 1
-            ready = [False for _ in media_ids]
-            for _ in range(5):
-                for idx, media_id in enumerate(media_ids):
-                    try:
-                        _ = self.mastodon.media(media_id)
+            pending = media_ids
+            for attempt in range(retries):
+                # probe all medias that are not ready yet at the same time
+                results = await asyncio.gather(*(self._run_sync(self.mastodon.media, media_id) for media_id in pending),
+                                               return_exceptions=True)
+                not_ready = []
+                for media_id, result in zip(pending, results):
+                    if isinstance(result, MastodonAPIError):
+                        # https://docs.joinmastodon.org/methods/media/#206-partial-content
+                        not_ready.append(media_id)
+                    elif isinstance(result, BaseException):
+                        raise result
+                    elif result.url is None:
+                        # the api answers 206 with a null url while the media is still being processed
+                        not_ready.append(media_id)
+                    else:
                         logger.info('Media %s is ready', media_id)
-                        ready[idx] = True
-                    except MastodonAPIError as e:
-                        if e.args[1] == 206:
-                            # https://docs.joinmastodon.org/methods/media/#206-partial-content
-                            logger.info('Media %s is not ready, wait for %d seconds', media_id, wait_time)
-                if all(ready):
+                if not (pending := not_ready):
                     return
+                if attempt == retries - 1:
+                    # no need to wait if there is no retry left
+                    break
+                logger.info('Media %s is not ready, wait for %d seconds', pending, wait_time)
                 await asyncio.sleep(wait_time)
                 wait_time *= 2
-            raise TimeoutError('Media is not ready after 5 retries')
+            raise TimeoutError(f'Media is not ready after {retries} retries')
 
-        cfg = self.telegram_to_mastodon
-        media_ids = []
-        text = messages[0].caption or ''
+        # reject what will not be forwarded before downloading anything
+        if (cnt := len(medias)) > 4:
+            logger.warning('Too many medias: %d, it may not be supported by mastodon', cnt)
+            return
+        # only one item of a media group carries the caption, and it is not always the first one
+        text = next((message.caption for message, _ in medias if message.caption), '')
         if not self.mastodon_filter(text):
             logger.info('Do not forward this channel message to mastodon.')
             return
-        text += f'\n\n{footer}'
-        if cnt := len(messages) > 4:
-            logger.warning('Too many medias: %d, it may not be supported by mastodon', cnt)
-            return
-        with TemporaryDirectory(prefix='mastodon') as tmpdir:
-            for message in messages:
-                media_type = effective_message_type(message)
-                if media_type not in ('photo', 'video'):
-                    logger.warning('Unsupported media type: %s', media_type)
-                    continue
-                media_file = await (message.photo[-1] if media_type == 'photo' else cast(Video, message.effective_attachment)).get_file()
-                file_path = os.path.join(tmpdir, media_file.file_unique_id)
-                await media_file.download_to_drive(custom_path=file_path)
-                media_ids.append(self.mastodon.media_post(file_path).id)
+        text = '\n\n'.join(filter(None, (text, footer)))
+        uploads = []
+        for message, media_type in medias:
+            if media_type not in ('photo', 'video'):
+                logger.warning('Unsupported media type: %s', media_type)
+                continue
+            uploads.append(_transfer(message, media_type))
+        # download and upload all medias at the same time, gather keeps them in the original order
+        media_ids = [media.id for media in await asyncio.gather(*uploads)]
         await _wait_for_media_ready(media_ids)
-        status: AttribAccessDict = self.mastodon.status_post(text, visibility='public', media_ids=media_ids)
-        success_message = f'*Successfully forward message to mastodon.*\n{status.url}'
-        if messages[0].is_automatic_forward:
-            await messages[0].reply_markdown(success_message)
-        else:
-            await context.bot.send_message(cfg.pm_chat_id, success_message, parse_mode=ParseMode.MARKDOWN)
+        status: AttribAccessDict = await self._call_with_backoff(
+            partial(self._run_sync, self.mastodon.status_post, text, visibility='public', media_ids=media_ids,
+                    idempotency_key=_idempotency_key(medias[0][0])))
+        await self._report_success(medias[0][0], status, context)
 
     async def _media_group_sender(self, context: CallbackContext) -> None:
         cfg = self.telegram_to_mastodon
@@ -129,11 +337,10 @@ class Bridge:
             if context.job is None:
                 logger.warning('No media group context.')
                 return
-            context.job.data = cast(MediaGroup, context.job.data)
-            await self._send_media_to_mastodon(*context.job.data.message, footer=context.job.data.footer, context=context)
+            media_group = cast(MediaGroup, context.job.data)
+            await self._send_media_to_mastodon(*media_group.medias, footer=media_group.footer, context=context)
         except Exception as exc:
-            logger.exception(exc)
-            await context.bot.send_message(cfg.pm_chat_id, f'```\n{format_exception(exc)}\n```', parse_mode=ParseMode.MARKDOWN)
+            await self._report_exception(exc, cfg.pm_chat_id, context)
 
     async def _send_message_to_mastodon(self, update: Update, context: CallbackContext) -> None:
         message = update.effective_message
@@ -146,6 +353,9 @@ class Bridge:
             await message.reply_text('This bot is only for specific channel or chat.')
             return
         logger.info('Received channel message from chat id: %d', message.chat_id)
+        if self._is_duplicate((message.chat_id, message.message_id)):
+            logger.info('Message %d was received before, skip it.', message.message_id)
+            return
 
         try:
             media_type = effective_message_type(message)
@@ -163,38 +373,46 @@ class Bridge:
                     if context.job_queue is None:
                         logger.error('Cannot get job queue in the context. Ignore this message.')
                         return
-                    jobs = context.job_queue.get_jobs_by_name(str(message.media_group_id))
+                    name = str(message.media_group_id)
+                    jobs = context.job_queue.get_jobs_by_name(name)
                     if jobs:
-                        cast(MediaGroup, jobs[0].data).message.append(message)
+                        media_group = cast(MediaGroup, jobs[0].data)
+                        media_group.medias.append((message, media_type))
+                        # push the job back while items keep arriving, but never past the cap
+                        jobs[0].schedule_removal()
+                        delay = min(_MEDIA_GROUP_DEBOUNCE,
+                                    media_group.first_seen + _MEDIA_GROUP_MAX_WAIT - time.monotonic())
                     else:
                         footer = self.mastodon_footer(message)
-                        context.job_queue.run_once(self._media_group_sender, 5,
-                                                   data=MediaGroup(message=[message], footer=footer),
-                                                   name=str(message.media_group_id))
+                        media_group = MediaGroup(medias=[(message, media_type)], footer=footer, first_seen=time.monotonic())
+                        delay = _MEDIA_GROUP_DEBOUNCE
+                    context.job_queue.run_once(self._media_group_sender, max(delay, 0),
+                                               data=media_group, name=name)
                 else:
                     footer = self.mastodon_footer(message)
-                    await self._send_media_to_mastodon(message, footer=footer, context=context)
+                    await self._send_media_to_mastodon((message, media_type), footer=footer, context=context)
             elif media_type == 'text':
                 text = message.text
                 if not self.mastodon_filter(text):
                     logger.info('Do not forward this channel message to mastodon.')
                     return
                 footer = self.mastodon_footer(message)
-                text += f'\n\n{footer}'
-                status: AttribAccessDict = self.mastodon.status_post(status=text, visibility='public')
-                success_message = f'*Successfully forward message to mastodon.*\n{status.url}'
-                if message.is_automatic_forward:
-                    await message.reply_markdown(success_message)
-                else:
-                    await context.bot.send_message(cfg.pm_chat_id, success_message, parse_mode=ParseMode.MARKDOWN)
+                text = '\n\n'.join(filter(None, (text, footer)))
+                status: AttribAccessDict = await self._call_with_backoff(
+                    partial(self._run_sync, self.mastodon.status_post, status=text, visibility='public',
+                            idempotency_key=_idempotency_key(message)))
+                await self._report_success(message, status, context)
             else:
                 logger.info('Unsupported message type, skip it.')
         except Exception as exc:
-            logger.exception(exc)
-            await context.bot.send_message(cfg.pm_chat_id, f'```\n{format_exception(exc)}\n```', parse_mode=ParseMode.MARKDOWN)
+            await self._report_exception(exc, cfg.pm_chat_id, context)
 
     async def _send_message_to_telegram(self, status: AttribAccessDict, context: CallbackContext) -> None:
         cfg = self.mastodon_to_telegram
+        # the stream may deliver a status again after it reconnects
+        if self._is_duplicate(status.id):
+            logger.info('Status %s was received before, skip it.', status.id)
+            return
         try:
             if status.account.username == self._mastodon_username and \
                 (status.application is None or status.application.name != self._mastodon_app_name) and \
@@ -207,32 +425,56 @@ class Bridge:
                             logger.warning('Cannot forward reblog link to telegram because the original message is not public.')
                             return
                         text = markdownify(self.telegram_footer(status.reblog))
-                        logger.info('Sending message to telegram channel:\n %s', text)
-                        await context.bot.send_message(cfg.channel_chat_id, text, parse_mode=ParseMode.MARKDOWN)
+                        logger.info('Sending message to telegram channel:\n %.200s', text)
+                        await self._call_with_backoff(partial(context.bot.send_message, cfg.channel_chat_id, text))
                         return
                     status = status.reblog
-                text = markdownify(status.content)
+                # parsing a long status takes a while, do not block the event loop meanwhile
+                text = await asyncio.to_thread(markdownify, status.content)
                 if status.spoiler_text:
                     text = f'*{status.spoiler_text}*\n\n{text}'
-                logger.info('Sending message to telegram channel: %s', text)
-                text += '\n' + markdownify(self.telegram_footer(status))
-                if len(status.media_attachments) > 0:
-                    medias: list[InputMediaPhoto | InputMediaVideo] = []
-                    for item in status.media_attachments:
-                        if item.type == 'image':
-                            medias.append(InputMediaPhoto(item.url, parse_mode=ParseMode.MARKDOWN))
-                        elif item.type == 'video':
-                            medias.append(InputMediaVideo(item.url, parse_mode=ParseMode.MARKDOWN))
-                    medias[0].caption = text
+                logger.info('Sending message to telegram channel: %.200s', text)
+                text = '\n'.join(filter(None, (text, markdownify(self.telegram_footer(status)))))
+                attachments = [(media_class, item.url) for item in status.media_attachments
+                               if (media_class := _INPUT_MEDIA_CLASSES.get(item.type))]
+                if attachments:
+                    # telegram objects are immutable, so the caption goes to the first media on creation
+                    medias: list[InputMediaPhoto | InputMediaVideo] = [
+                        media_class(url, caption=None if idx else text)
+                        for idx, (media_class, url) in enumerate(attachments)
+                    ]
                     logger.info('Sending media group to telegram channel.')
-                    await context.bot.send_media_group(cfg.channel_chat_id, medias)
+                    await self._call_with_backoff(partial(context.bot.send_media_group, cfg.channel_chat_id, medias))
                 else:
                     logger.info('Sending pure-text message to telegram channel.')
-                    await context.bot.send_message(cfg.channel_chat_id, text,
-                                                         parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
+                    await self._call_with_backoff(partial(context.bot.send_message, cfg.channel_chat_id, text,
+                                                          disable_web_page_preview=True))
         except Exception as exc:
-            logger.exception(exc)
-            await context.bot.send_message(cfg.pm_chat_id, f'```\n{format_exception(exc)}\n```', parse_mode=ParseMode.MARKDOWN)
+            await self._report_exception(exc, cfg.pm_chat_id, context)
+
+    async def _start_mastodon_stream(self, app: Application) -> None:
+        if self.mastodon_to_telegram.disable:
+            return
+        loop = asyncio.get_running_loop()
+
+        def update_handler(status: AttribAccessDict) -> None:
+            # called from the mastodon stream thread, so hand the status over to the running event loop
+            # and block the stream while the update queue is full
+            future = asyncio.run_coroutine_threadsafe(app.update_queue.put(status), loop)
+            try:
+                future.result(timeout=_UPDATE_QUEUE_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                logger.warning('Update queue is full, drop status %s', status.id)
+                return
+            if (pending := app.update_queue.qsize()) >= _UPDATE_QUEUE_SIZE // 2:
+                logger.warning('Forwarding lags behind the mastodon stream, %d updates are waiting', pending)
+
+        listener = CallbackStreamListener(update_handler=update_handler)
+        # opening the stream is a blocking request, the stream itself then runs in its own thread
+        # jitter the reconnect delay, so bridges on the same instance do not reconnect all at once after an outage
+        await self._run_sync(self.mastodon.stream_user, listener=listener, run_async=True, reconnect_async=True,
+                             reconnect_async_wait_sec=_STREAM_RECONNECT_WAIT * (1 + random.random()))
 
     async def _start(self, update: Update, _: CallbackContext) -> None:
         await update.message.reply_text('Hi!')
@@ -252,10 +494,8 @@ class Bridge:
             logger.info('Skip running, because it is a dry run.')
             return
         if not self.mastodon_to_telegram.disable:
-            def update_handler(status: AttribAccessDict): return asyncio.run(app.update_queue.put(status))
-            listener = CallbackStreamListener(update_handler=update_handler)
+            # the stream itself is started in post_init, once the event loop is running
             app.add_handler(TypeHandler(AttribAccessDict, self._send_message_to_telegram))
-            self.mastodon.stream_user(listener=listener, run_async=True, reconnect_async=True)
         else:
             logger.warning('Skip mastodon stream, because mastodon to telegram is disabled.')
 
@@ -265,4 +505,14 @@ class Bridge:
             app.add_handler(MessageHandler(UpdateType.CHANNEL_POST, self._send_message_to_mastodon))
         else:
             logger.warning('Skip telegram message handler, because telegram to mastodon is disabled.')
-        app.run_polling()
+        if uvloop is not None:
+            # uvloop handles sockets much faster than the default event loop
+            uvloop.install()
+            logger.info('Using uvloop event loop.')
+        else:
+            logger.info('Using default asyncio event loop.')
+        if self._webhook:
+            logger.info('Receiving telegram updates by webhook.')
+            app.run_webhook(**self._webhook)
+        else:
+            app.run_polling()
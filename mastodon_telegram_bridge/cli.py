@@ -1,14 +1,51 @@
+from __future__ import annotations
+
 import argparse
-from typing import Type, cast, overload
+import atexit
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, Type, cast, overload
 
 import betterlogging as logging
-import tomli
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
 
 from ._version import __version__ as version
-from .bridge import Bridge
-from .filter import Filter
-from .footer import Footer
-from .typing import ConfigDict
+
+if TYPE_CHECKING:
+    from .filter import Filter
+    from .footer import Footer
+    from .typing import ConfigDict
+
+
+class _LocalQueueHandler(QueueHandler):
+    """Queue handler for a queue in the same process
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the record never leaves the process, so hand it over untouched and let the listener's handlers
+        # format it, including betterlogging's colorized traceback from exc_info
+        return record
+
+
+def _setup_logging(level: int) -> None:
+    """Setup colorized logging, with records written to stderr from a background thread
+
+    Args:
+        level (int): logging level
+    """
+    logging.basic_colorized_config(level=level)
+    root = logging.getLogger()
+    queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [_LocalQueueHandler(queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
 
 @overload
 def main() -> None: ...
@@ -65,9 +102,12 @@ def main(**kwargs) -> None:
     else:
         level = logging.INFO
 
-    logging.basic_colorized_config(level=level)
+    _setup_logging(level)
+
+    # telegram and mastodon are slow to import, so only do it once the arguments are known to be good
+    from .bridge import Bridge
 
     with open(args.config, 'rb') as cfg:
-        config = cast(ConfigDict, tomli.load(cfg))
+        config = cast('ConfigDict', tomllib.load(cfg))
     bridge = Bridge(**config, **kwargs)
     bridge.run(dry_run=args.dry_run)
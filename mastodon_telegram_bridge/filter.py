@@ -1,11 +1,37 @@
 import logging
-from typing import Any, Iterable
+import re
+from typing import Any, Iterable, Optional, Pattern
 
 from mastodon import AttribAccessDict
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_tags(name: str, tags: Iterable[str]) -> frozenset[str]:
+    """Validate tags and collect them into a set in a single pass
+
+    Args:
+        name (str): name of the option, used in error messages
+        tags (Iterable[str]): the tags
+
+    Returns:
+        frozenset[str]: the tags
+
+    Raises:
+        ValueError: if tags is not an iterable of strings starting with #
+    """
+    if not isinstance(tags, Iterable):
+        raise ValueError(f'{name} must be an iterable, got: {type(tags)}')
+    normalized = set()
+    for tag in tags:
+        if not isinstance(tag, str):
+            raise ValueError(f'{name} tags must be strings, got: {type(tag)}')
+        if not tag.startswith('#'):
+            raise ValueError(f'{name} tags must start with #, got: {tag!r}')
+        normalized.add(tag)
+    return frozenset(normalized)
+
+
 class Filter:
     """Filter for messages
 
@@ -33,7 +59,7 @@ class Filter:
 
     def __init__(self, **kwargs) -> None:
         if kwargs:
-            logger.warning(f'Unused arguments: {kwargs}')
+            logger.warning('Unused arguments: %s', kwargs)
 
     def __call__(self, _: Any) -> bool:
         """Filter message, check if it should be forwarded
@@ -66,39 +92,38 @@ class MastodonFilter(Filter):
 
     def __init__(self, *, include: Iterable[str], exclude: Iterable[str], **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.include = include
-        self.exclude = exclude
-        self.__check_tags()
-
-    def __check_tags(self) -> None:
-        if not isinstance(self.include, Iterable):
-            raise ValueError(f'include must be an iterable, got: {type(self.include)}')
-        if not isinstance(self.exclude, Iterable):
-            raise ValueError(f'exclude must be an iterable, got: {type(self.exclude)}')
-        if not all(isinstance(tag, str) for tag in self.include):
-            raise ValueError(f'include tags must be strings, got: {type(self.include)}')
-        if not all(isinstance(tag, str) for tag in self.exclude):
-            raise ValueError(f'exclude tags must be strings, got: {type(self.exclude)}')
-        for tag in self.include:
-            if tag in self.exclude:
-                raise ValueError(f'include and exclude tags overlap: {tag}')
-        if not all(tag.startswith('#') for tag in self.include):
-            raise ValueError(f'include tags must start with #, got: {self.include}')
-        if not all(tag.startswith('#') for tag in self.exclude):
-            raise ValueError(f'exclude tags must start with #, got: {self.exclude}')
+        self.include = _normalize_tags('include', include)
+        self.exclude = _normalize_tags('exclude', exclude)
+        # tags are matched case-insensitively, so they overlap regardless of case
+        if overlap := {tag.casefold() for tag in self.include} & {tag.casefold() for tag in self.exclude}:
+            raise ValueError(f'include and exclude tags overlap: {", ".join(sorted(overlap))}')
+        self._include_pattern = self.__compile_tags(self.include)
+        self._exclude_pattern = self.__compile_tags(self.exclude)
+
+    @staticmethod
+    def __compile_tags(tags: Iterable[str]) -> Optional[Pattern[str]]:
+        # match all tags in a single scan instead of one substring search per tag,
+        # hashtags are case-insensitive on both telegram and mastodon
+        if not tags:
+            return None
+        return re.compile('|'.join(map(re.escape, tags)), re.IGNORECASE)
 
     def __call__(self, text: str) -> bool:
-        excluded = any(tag in text for tag in self.exclude)
-        if include := self.include:
-            return any(tag in text for tag in include) and not excluded
-        return not excluded
+        if '#' not in text:
+            # every tag starts with #, so none of them can match
+            return self._include_pattern is None
+        if self._exclude_pattern is not None and self._exclude_pattern.search(text):
+            return False
+        if self._include_pattern is not None:
+            return self._include_pattern.search(text) is not None
+        return True
 
 
 class TelegramFilter(Filter):
 
     def __init__(self, *, scope: Iterable[str],  **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.scope = scope
+        self.scope = frozenset(scope)
         self.__check_scope()
 
     def __check_scope(self):
@@ -106,5 +131,6 @@ class TelegramFilter(Filter):
             raise ValueError('scope must be one of public, unlisted, private or direct')
 
     def __call__(self, status: AttribAccessDict) -> bool:
-        return status.in_reply_to_id is None and \
-            status.visibility in self.scope
+        # the scope check rejects most statuses, so run it first
+        return status.visibility in self.scope and \
+            status.in_reply_to_id is None
@@ -27,7 +27,7 @@ class Footer:
 
     def __init__(self, **kwargs) -> None:
         if kwargs:
-            logger.warning(f'Unused arguments: {kwargs}')
+            logger.warning('Unused arguments: %s', kwargs)
 
     def _forwarded_from(self, name: str) -> str:
         return f'Forwarded from {name}'
@@ -48,6 +48,7 @@ class MastodonFooter(Footer):
         super().__init__(**kwargs)
         self.add_link = add_link
         self.show_forward_from = show_forward_from
+        self._enabled = bool(add_link or show_forward_from)
 
     def __get_forward_name(self, message: Message) -> Optional[str]:
         if message.forward_from:
@@ -63,6 +64,11 @@ class MastodonFooter(Footer):
             return f'{chat_link}/{message.forward_from_message_id}'
         return None
 
+    def __call__(self, message: Message) -> str:
+        if not self._enabled:
+            return ''
+        return super().__call__(message)
+
     def make_footer(self, message: Message) -> list[str]:
         """generate footer
 
@@ -92,14 +98,23 @@ class TelegramFooter(Footer):
         self.add_link = add_link
         self.tags = tags
         self.__check_tags()
+        # the tags never change, so keep a copy and join them once
+        self.tags = tuple(self.tags)
+        self._tags_line = ' '.join(self.tags)
+        self._enabled = bool(add_link or self._tags_line)
 
     def __check_tags(self) -> None:
         if not isinstance(self.tags, Iterable):
             raise TypeError(f'tags must be an iterable, got {type(self.tags)}')
         if not all(isinstance(tag, str) for tag in self.tags):
             raise TypeError(f'tags must be an iterable of str, got {type(self.tags)}')
-        if not all(tag.startswith('#') for tag in self.tags):
-            raise ValueError(f'tags must start with #, got {self.tags}')
+        if (tag := next((tag for tag in self.tags if not tag.startswith('#')), None)) is not None:
+            raise ValueError(f'tags must start with #, got {tag!r}')
+
+    def __call__(self, status: AttribAccessDict) -> str:
+        if not self._enabled:
+            return ''
+        return super().__call__(status)
 
     def make_footer(self, status: AttribAccessDict) -> list[str]:
         """generate footer
@@ -113,6 +128,6 @@ class TelegramFooter(Footer):
         footer = []
         if self.add_link:
             footer.append(status.url)
-        if self.tags:
-            footer.append(' '.join(f'{tag}' for tag in self.tags))
+        if self._tags_line:
+            footer.append(self._tags_line)
         return footer
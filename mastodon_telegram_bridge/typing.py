@@ -1,4 +1,5 @@
-from typing import Iterable, MutableSequence, NamedTuple, Type, TypedDict
+from dataclasses import dataclass, field
+from typing import Iterable, MutableSequence, Type, TypedDict
 
 from telegram import Message
 
@@ -6,11 +7,14 @@ from .filter import Filter
 from .footer import Footer
 
 
-class MediaGroup(NamedTuple):
+@dataclass(slots=True)
+class MediaGroup:
     """MediaGroup
     """
-    message: MutableSequence[Message]
+    # messages of the group with their effective message types
+    medias: MutableSequence[tuple[Message, str]]
     footer: str
+    first_seen: float
 
 
 class OptionsDict(TypedDict):
@@ -28,7 +32,36 @@ class CustomArgs(TypedDict, total=False):
     telegram_footer: Type[Footer]
 
 
-class TelegramOptionsDict(TypedDict):
+class TelegramApplicationOptionsDict(TypedDict, total=False):
+    """Telegram Application Options Dict
+    """
+    concurrent_updates: bool | int
+    connection_pool_size: int
+    connect_timeout: float
+    read_timeout: float
+    write_timeout: float
+    pool_timeout: float
+
+
+class TelegramWebhookOptionsDict(TypedDict, total=False):
+    """Telegram Webhook Options Dict
+    """
+    listen: str
+    port: int
+    url_path: str
+    webhook_url: str
+    secret_token: str
+    cert: str
+    key: str
+
+
+class TelegramExtraOptionsDict(TelegramApplicationOptionsDict, total=False):
+    """Telegram Extra Options Dict
+    """
+    webhook: TelegramWebhookOptionsDict
+
+
+class TelegramOptionsDict(TelegramExtraOptionsDict):
     """TelegramOptionsDict
     """
     token: str
@@ -106,35 +139,38 @@ class ConfigDict(TypedDict):
 
 
 # Bridge Options
+# default dicts are built per instance, so one bridge cannot change the defaults of another
 
 
-class MastodonToTelegramOptions(NamedTuple):
+@dataclass(frozen=True, slots=True)
+class MastodonToTelegramOptions:
     """Mastodon To Telegram Options
     """
     disable: bool = False
     channel_chat_id: int = 0
     pm_chat_id: int = 0
     forward_reblog_link_only: bool = True
-    filter: OptionsDict = MastodonToTelegramFilterOptionsDict(
+    filter: OptionsDict = field(default_factory=lambda: MastodonToTelegramFilterOptionsDict(
         scope=['public', 'unlisted'],
-    )
-    footer: OptionsDict = MastodonToTelegramFooterOptionsDict(
+    ))
+    footer: OptionsDict = field(default_factory=lambda: MastodonToTelegramFooterOptionsDict(
         add_link=True,
         tags=['#mastodon'],
-    )
+    ))
 
 
-class TelegramToMastodonOptions(NamedTuple):
+@dataclass(frozen=True, slots=True)
+class TelegramToMastodonOptions:
     """Telegram To Mastodon Options
     """
     disable: bool = False
     channel_chat_id: int = 0
     pm_chat_id: int = 0
-    filter: OptionsDict = TelegramToMastodonFilterOptionsDict(
+    filter: OptionsDict = field(default_factory=lambda: TelegramToMastodonFilterOptionsDict(
         include=[],
         exclude=['#nofwd', '#noforward', '#mastodon'],
-    )
-    footer: OptionsDict = TelegramToMastodonFooterOptionsDict(
+    ))
+    footer: OptionsDict = field(default_factory=lambda: TelegramToMastodonFooterOptionsDict(
         add_link=False,
         show_forward_from=True,
-    )
+    ))
@@ -1,5 +1,48 @@
-from betterlogging.outer.better_exceptions import ExceptionFormatter
+import re
+import socket
+import traceback
+from functools import lru_cache
+from typing import Any, Optional, Pattern
+
+import requests
+from bs4 import BeautifulSoup
 from markdownify import MarkdownConverter
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # noqa: F401
+    # lxml builds the soup in C, which is much faster than the pure python html.parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# probe idle connections (e.g. the mastodon stream) so dead peers are noticed and NATs keep the mapping
+KEEPALIVE_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3))
+    if hasattr(socket, name)
+]
+
+# only retry connections that could not be established, the request never reached the server then,
+# failures after the request was sent are left to the bridge, which retries the whole api call
+HTTP_RETRY = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+
+# characters escaped by TelegramMarkdownConverter, and the options enabling them
+ESCAPE_OPTIONS = (('*', 'escape_asterisks'), ('_', 'escape_underscores'),
+                  ('[', 'escape_brackets'), ('`', 'escape_backquote'))
+
+
+@lru_cache(maxsize=None)
+def _escape_table(chars: str) -> dict[int, str]:
+    # at most 16 combinations, each table is built once and shared by all converters
+    return str.maketrans({char: f'\\{char}' for char in chars})
+
+
+@lru_cache(maxsize=None)
+def _escape_pattern(chars: str) -> Optional[Pattern[str]]:
+    return re.compile(f'[{re.escape(chars)}]') if chars else None
 
 
 class TelegramMarkdownConverter(MarkdownConverter):
@@ -17,6 +60,24 @@ class TelegramMarkdownConverter(MarkdownConverter):
         escape_brackets = True
         escape_backquote = True
 
+    def __init__(self, **options) -> None:
+        super().__init__(**options)
+        # escape all enabled characters in a single pass
+        chars = ''.join(char for char, option in ESCAPE_OPTIONS if self.options[option])
+        self._escape_table = _escape_table(chars)
+        self._escape_pattern = _escape_pattern(chars)
+
+    def convert(self, html: str) -> str:
+        """Convert html to telegram markdown
+
+        Args:
+            html (str): html to convert
+
+        Returns:
+            str: converted markdown
+        """
+        return self.convert_soup(BeautifulSoup(html, HTML_PARSER))
+
     def escape(self, text: str) -> str:
         """Escape some characters
 
@@ -28,15 +89,15 @@ class TelegramMarkdownConverter(MarkdownConverter):
         """
         if not text:
             return ''
-        if self.options['escape_asterisks']:
-            text = text.replace('*', r'\*')
-        if self.options['escape_underscores']:
-            text = text.replace('_', r'\_')
-        if self.options['escape_brackets']:
-            text = text.replace('[', r'\[')
-        if self.options['escape_backquote']:
-            text = text.replace('`', r'\`')
-        return text
+        if self._escape_pattern is None or not self._escape_pattern.search(text):
+            # most texts have nothing to escape, return them without copying
+            return text
+        return text.translate(self._escape_table)
+
+
+@lru_cache(maxsize=16)
+def _get_converter(options: tuple[tuple[str, Any], ...]) -> TelegramMarkdownConverter:
+    return TelegramMarkdownConverter(**dict(options))
 
 
 def markdownify(text: str, **options) -> str:
@@ -48,7 +109,13 @@ def markdownify(text: str, **options) -> str:
     Returns:
         str: converted text
     """
-    return TelegramMarkdownConverter(**options).convert(text)
+    try:
+        # converters hold no state between conversions, so reuse one per option set
+        converter = _get_converter(tuple(sorted(options.items())))
+    except TypeError:
+        # unhashable option values, e.g. a list of tags to strip
+        converter = TelegramMarkdownConverter(**options)
+    return converter.convert(text)
 
 
 def format_exception(exc: Exception) -> str:
@@ -60,4 +127,28 @@ def format_exception(exc: Exception) -> str:
     Returns:
         str: formatted exception
     """
-    return ''.join(ExceptionFormatter().format_exception(type(exc), exc, exc.__traceback__))
+    return ''.join(traceback.format_exception(exc))
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with TCP keep-alive enabled on its sockets
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs.setdefault('socket_options', HTTPConnection.default_socket_options + KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def make_session(pool_maxsize: int = 16) -> requests.Session:
+    """Make a requests session with a keep-alive connection pool that retries failed connections
+
+    Args:
+        pool_maxsize (int, optional): max connections kept per host. Defaults to 16.
+
+    Returns:
+        requests.Session: the session
+    """
+    session = requests.Session()
+    session.mount('https://',
+                  KeepAliveHTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=HTTP_RETRY))
+    return session